@@ -0,0 +1,13 @@
+#!/usr/bin/env sh
+# Production launcher: one uvicorn worker per CPU by default.
+# Rate-limit state is in-process, so each worker enforces its own limit
+# (effective limit is RATE_LIMIT_REQUESTS x workers per client IP).
+# Every uvicorn worker owns an extraction pool, so the per-worker pool
+# defaults to one process to keep the total at about one per CPU.
+export EXTRACTION_WORKERS="${EXTRACTION_WORKERS:-1}"
+exec python -m uvicorn src.main:app \
+    --host "${API_HOST:-0.0.0.0}" \
+    --port "${API_PORT:-8000}" \
+    --loop uvloop \
+    --http httptools \
+    --workers "${UVICORN_WORKERS:-$(nproc)}"
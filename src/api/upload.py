@@ -1,17 +1,16 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException, Request, Depends, status
-from slowapi import Limiter
-from slowapi.util import get_remote_address
+from fastapi import APIRouter, UploadFile, File, Request, Depends, Response, status
 import logging
-import os
+import orjson
 from pathlib import Path
 from typing import List
 
-from ..models.schemas import CustomerRecord, FileUploadResponse, ErrorResponse
-from ..services.extraction import DataExtractionService
+from ..models.schemas import CustomerRecord, FileUploadResponse
+from ..services.extraction import DataExtractionService, extract_in_worker
 from ..services.api_client import APIClientService
-from ..core.security import FileSecurityValidator
-from ..core.config import settings
-from ..core.rate_limit import limiter
+from ..services.worker_pool import ExtractorPool
+from ..core.security import validate_file_security
+from ..core.config import FrozenSettings, get_settings
+from ..core.rate_limit import get_remote_address, rate_limit
 
 logger = logging.getLogger(__name__)
 
@@ -21,12 +20,39 @@ router = APIRouter(prefix="/api/v1", tags=["upload"])
 extraction_service = DataExtractionService()
 api_client = APIClientService()
 
+# CPU-heavy parsers run in worker processes so they don't block the event loop
+CPU_BOUND_EXTENSIONS = frozenset({'.pdf', '.docx', '.xlsx'})
+extractor_pool = ExtractorPool(
+    max_workers=get_settings().extraction_workers,
+    log_file=get_settings().log_file
+)
+
+# Error bodies are built once; variable details are overlaid per request.
+# Responses keep the HTTPException wire shape: {"detail": {"error": ..., "detail": ...}}
+SECURITY_ERR_PREFIX = {"error": "Security validation failed", "detail": None}
+VALIDATION_ERR_PREFIX = {"error": "Data validation failed", "detail": None}
+CONNECTION_ERR_PREFIX = {"error": "Connection test failed", "detail": None}
+INTERNAL_ERR_BODY = orjson.dumps({
+    "detail": {
+        "error": "Internal server error",
+        "detail": "An unexpected error occurred while processing the file"
+    }
+})
+
+
+def _error_response(status_code: int, body: bytes) -> Response:
+    return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def _error_body(prefix: dict, detail: str) -> bytes:
+    return orjson.dumps({"detail": {**prefix, "detail": detail}})
 
-@router.post("/upload", response_model=FileUploadResponse)
-@limiter.limit(f"{settings.rate_limit_requests}/{settings.rate_limit_window}m")
+
+@router.post("/upload", response_model=FileUploadResponse, dependencies=[Depends(rate_limit)])
 async def upload_file(
     request: Request,
-    file: UploadFile = File(..., description="Upload file (CSV, XLSX, PDF, DOCX, JSON)")
+    file: UploadFile = File(..., description="Upload file (CSV, XLSX, PDF, DOCX, JSON)"),
+    settings: FrozenSettings = Depends(get_settings)
 ):
     """
     Upload and process customer data file
@@ -41,28 +67,34 @@ async def upload_file(
     logger.info(f"File upload request from IP: {client_ip}, filename: {file.filename}")
 
     # Validate file security
-    is_valid, error_message = FileSecurityValidator.validate_file_security(
+    is_valid, error_message = validate_file_security(
         file,
         max_size=settings.max_file_size
     )
 
     if not is_valid:
         logger.warning(f"Security validation failed for IP: {client_ip}, error: {error_message}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ErrorResponse(
-                error="Security validation failed",
-                detail=error_message
-            ).dict()
+        return _error_response(
+            status.HTTP_400_BAD_REQUEST,
+            _error_body(SECURITY_ERR_PREFIX, error_message)
         )
 
     try:
-        # Read file content
-        file_content = await file.read()
-
-        # Extract data from file
         logger.info(f"Extracting data from file: {file.filename}")
-        customers = await extraction_service.extract_data_from_file(file_content, file.filename)
+        file_ext = Path(file.filename).suffix.lower()
+        if file_ext in CPU_BOUND_EXTENSIONS:
+            # Worker processes need picklable input, so these formats are read into memory
+            file_content = await file.read()
+            if file_ext == '.pdf':
+                # Page text is extracted in the pool; the AI request then runs in a thread
+                customers = await extraction_service.extract_data_from_file(
+                    file_content, file.filename, pool=extractor_pool
+                )
+            else:
+                customers = await extractor_pool.run(extract_in_worker, file_content, file.filename)
+        else:
+            # Extract straight from the spooled upload instead of copying it into memory
+            customers = await extraction_service.extract_data_from_file(file.file, file.filename)
 
         if not customers:
             logger.warning(f"No customer records found in file: {file.filename}")
@@ -74,47 +106,40 @@ async def upload_file(
 
         # Sync data to external API
         logger.info(f"Syncing {len(customers)} customer records to external API")
-        sync_success, sync_error = await api_client.sync_customer_data(customers)
+        sync_success, sync_error, synced_count = await api_client.sync_customer_data(customers)
+        duplicates = len(customers) - synced_count
+        skipped_note = f" ({duplicates} duplicate records skipped)" if duplicates else ""
 
         if sync_success:
-            logger.info(f"Successfully processed file: {file.filename}, records: {len(customers)}")
+            logger.info(f"Successfully processed file: {file.filename}, records: {synced_count}")
             return FileUploadResponse(
                 success=True,
-                message=f"Successfully processed {len(customers)} customer records",
-                processed_records=len(customers)
+                message=f"Successfully processed {synced_count} customer records{skipped_note}",
+                processed_records=synced_count
             )
         else:
             logger.error(f"Failed to sync data for file: {file.filename}, error: {sync_error}")
             # Data was extracted but sync failed
             return FileUploadResponse(
                 success=False,
-                message=f"Extracted {len(customers)} records but failed to sync to external API",
-                processed_records=len(customers),
+                message=f"Extracted {synced_count} records{skipped_note} but failed to sync to external API",
+                processed_records=synced_count,
                 errors=[sync_error] if sync_error else None
             )
 
     except ValueError as e:
         logger.error(f"Validation error for file {file.filename}: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=ErrorResponse(
-                error="Data validation failed",
-                detail=str(e)
-            ).dict()
+        return _error_response(
+            status.HTTP_400_BAD_REQUEST,
+            _error_body(VALIDATION_ERR_PREFIX, str(e))
         )
     except Exception as e:
         logger.error(f"Unexpected error processing file {file.filename}: {str(e)}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ErrorResponse(
-                error="Internal server error",
-                detail="An unexpected error occurred while processing the file"
-            ).dict()
-        )
+        return _error_response(status.HTTP_500_INTERNAL_SERVER_ERROR, INTERNAL_ERR_BODY)
 
 
 @router.get("/upload/health")
-async def health_check():
+async def health_check(settings: FrozenSettings = Depends(get_settings)):
     """
     Health check endpoint for the upload service
     """
@@ -144,10 +169,7 @@ async def test_api_connection():
                 "error": error
             }
     except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=ErrorResponse(
-                error="Connection test failed",
-                detail=str(e)
-            ).dict()
+        return _error_response(
+            status.HTTP_500_INTERNAL_SERVER_ERROR,
+            _error_body(CONNECTION_ERR_PREFIX, str(e))
         )
\ No newline at end of file
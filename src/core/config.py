@@ -1,8 +1,13 @@
-from pydantic_settings import BaseSettings
+from dataclasses import dataclass
+from functools import lru_cache
+import os
+from pydantic_settings import BaseSettings, SettingsConfigDict
 from typing import Optional
 
 
 class Settings(BaseSettings):
+    model_config = SettingsConfigDict(env_file=".env", case_sensitive=False, frozen=True)
+
     app_name: str = "Pocket CM AI Onboarding Agent"
     app_version: str = "1.0.0"
     debug: bool = False
@@ -10,10 +15,11 @@ class Settings(BaseSettings):
     # API Settings
     api_host: str = "0.0.0.0"
     api_port: int = 8000
+    cors_origins: list[str] = []  # empty means "*" in debug, no cross-origin access otherwise
 
     # File Upload Settings
     max_file_size: int = 10 * 1024 * 1024  # 10MB
-    allowed_mime_types: list[str] = [
+    allowed_mime_types: tuple[str, ...] = (
         "application/csv",
         "text/csv",
         "text/plain",  # csv files sometimes detected as plain text
@@ -21,9 +27,16 @@ class Settings(BaseSettings):
         "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
         "application/pdf",
         "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-        "application/json"
-    ]
+        "application/json",
+    )
     upload_dir: str = "uploads"
+    log_file: str = "app.log"
+
+    # Extraction Settings
+    # extraction_workers is the whole process budget for CPU-bound parsing in
+    # one app process: PDF page chunks share the same pool, nothing nests
+    extraction_workers: int = os.cpu_count() or 1
+    extraction_chunk_size: int = 200  # PDF pages per pool task
 
     # OpenAI Settings (for AI extraction)
     openai_api_key: Optional[str] = None
@@ -33,14 +46,60 @@ class Settings(BaseSettings):
     destination_api_url: str = "https://webhook.site/9c3470f6-14e9-4ae2-beb7-6d2ecfb7ee55"
     max_retries: int = 3
     retry_delay: float = 1.0
+    retry_max_delay: float = 30.0  # cap for backoff and Retry-After waits
+    api_concurrency: int = 16  # max in-flight record POSTs
+    prefer_batch: bool = True  # one batch POST per upload instead of per-record POSTs
 
     # Rate Limiting
     rate_limit_requests: int = 5
     rate_limit_window: int = 60  # seconds
 
-    class Config:
-        env_file = ".env"
-        case_sensitive = False
+
+# Settings are read on every request; once parsed from the environment, copy
+# them into a frozen, slotted dataclass so hot paths use plain slot lookups.
+# Fields mirror Settings one-to-one (tests/test_config.py checks for drift)
+@dataclass(frozen=True, slots=True)
+class FrozenSettings:
+    app_name: str
+    app_version: str
+    debug: bool
+
+    # API Settings
+    api_host: str
+    api_port: int
+    cors_origins: list[str]
+
+    # File Upload Settings
+    max_file_size: int
+    allowed_mime_types: tuple[str, ...]
+    upload_dir: str
+    log_file: str
+
+    # Extraction Settings
+    extraction_workers: int
+    extraction_chunk_size: int
+
+    # OpenAI Settings
+    openai_api_key: Optional[str]
+    openai_model: str
+
+    # External API Settings
+    destination_api_url: str
+    max_retries: int
+    retry_delay: float
+    retry_max_delay: float
+    api_concurrency: int
+    prefer_batch: bool
+
+    # Rate Limiting
+    rate_limit_requests: int
+    rate_limit_window: int
+
+
+@lru_cache(maxsize=1)
+def get_settings() -> FrozenSettings:
+    """Parse the environment/.env once; later calls return the cached instance"""
+    return FrozenSettings(**Settings().model_dump())
 
 
-settings = Settings()
+settings = get_settings()
@@ -0,0 +1,51 @@
+import logging
+import queue
+import sys
+from logging.handlers import QueueHandler, QueueListener
+
+LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+
+def setup_logging(log_file: str) -> QueueListener:
+    """
+    Configure root logging for the app process. The log file is written from a
+    listener thread so request handlers only enqueue records instead of blocking
+    on disk I/O; the caller stops the returned listener on shutdown
+    """
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    file_handler = logging.FileHandler(log_file)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    listener = QueueListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+
+    queue_handler = QueueHandler(log_queue)
+    # Only merge args into the message here; the file handler applies LOG_FORMAT
+    queue_handler.setFormatter(logging.Formatter('%(message)s'))
+
+    logging.basicConfig(
+        level=logging.INFO,
+        format=LOG_FORMAT,
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+            queue_handler
+        ],
+        force=True
+    )
+    return listener
+
+
+def configure_worker_logging(log_file: str) -> None:
+    """
+    Process-pool initializer: replace handlers inherited from the parent
+    (its QueueHandler feeds a queue nothing reads in the child) with
+    handlers that write straight to stdout and the log file
+    """
+    logging.basicConfig(
+        level=logging.INFO,
+        format=LOG_FORMAT,
+        handlers=[
+            logging.StreamHandler(sys.stdout),
+            logging.FileHandler(log_file)
+        ],
+        force=True
+    )
@@ -1,70 +1,130 @@
-from slowapi import Limiter, _rate_limit_exceeded_handler
-from slowapi.errors import RateLimitExceeded
-from slowapi.middleware import SlowAPIMiddleware
-from slowapi.util import get_remote_address
 from fastapi import Request, HTTPException, status
+from collections import OrderedDict, deque
 from typing import Dict
+import math
 import time
 import logging
 
+from .config import settings
+
 logger = logging.getLogger(__name__)
 
-# Initialize rate limiter
-limiter = Limiter(key_func=get_remote_address)
 
+def get_remote_address(request: Request) -> str:
+    """
+    Client IP used as the rate limit key
+    """
+    if not request.client or not request.client.host:
+        return "127.0.0.1"
+    return request.client.host
+
+
+class SlidingWindowLimiter:
+    """
+    In-process sliding-window log keyed by client IP.
+    Allows at most `capacity` hits per `window` seconds; tracks at most
+    `max_keys` clients, evicting the least recently seen first.
+    """
+
+    def __init__(self, capacity: int, window: float, max_keys: int = 10000):
+        self.capacity = capacity
+        self.window = window
+        self.max_keys = max_keys
+        self._hits: OrderedDict[str, deque[float]] = OrderedDict()
+
+    def _window_for(self, key: str, now: float) -> deque[float]:
+        dq = self._hits.get(key)
+        if dq is None:
+            dq = self._hits[key] = deque(maxlen=self.capacity)
+            if len(self._hits) > self.max_keys:
+                self._hits.popitem(last=False)
+        else:
+            self._hits.move_to_end(key)
 
-class CustomRateLimitExceeded(RateLimitExceeded):
-    """Custom rate limit exception with more detailed info"""
+        # Evict hits that fell out of the window
+        while dq and dq[0] <= now - self.window:
+            dq.popleft()
+        return dq
 
-    def __init__(self, detail: str):
-        super().__init__(detail=detail)
+    async def check(self, key: str) -> bool:
+        """
+        Record a hit for `key`; returns False when the window is full
+        """
+        now = time.monotonic()
+        dq = self._window_for(key, now)
+        if len(dq) >= self.capacity:
+            return False
+        dq.append(now)
+        return True
+
+    def remaining(self, key: str) -> int:
+        """Hits still allowed for `key` in the current window"""
+        return self.capacity - len(self._window_for(key, time.monotonic()))
+
+    def retry_after(self, key: str) -> int:
+        """Seconds until the oldest hit for `key` leaves the window"""
+        now = time.monotonic()
+        dq = self._window_for(key, now)
+        if len(dq) < self.capacity:
+            return 0
+        return math.ceil(self.window - (now - dq[0]))
+
+
+# Initialize rate limiter
+limiter = SlidingWindowLimiter(
+    capacity=settings.rate_limit_requests,
+    window=settings.rate_limit_window
+)
 
 
 def setup_rate_limits(app):
     """
     Setup rate limiting for the FastAPI application
     """
-    # Enable middleware so @limiter.limit actually blocks requests
-    app.add_middleware(SlowAPIMiddleware)
-
-    # Add rate limit error handler
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    # Limits are enforced per route through the `rate_limit` dependency
     app.state.limiter = limiter
 
-    logger.info("Rate limiting middleware initialized")
+    logger.info("Rate limiting initialized")
+
+
+async def rate_limit(request: Request):
+    """
+    FastAPI dependency enforcing the per-IP request limit
+    """
+    if not await limiter.check(get_remote_address(request)):
+        custom_rate_limit_handler(request)
 
 
-def get_rate_limit_headers() -> Dict[str, str]:
+def get_rate_limit_headers(key: str) -> Dict[str, str]:
     """
     Get rate limit headers for responses
     """
     return {
-        "X-RateLimit-Limit": "5",
-        "X-RateLimit-Window": "60",
-        "X-RateLimit-Remaining": "5",
-        "X-RateLimit-Reset": str(int(time.time()) + 60)
+        "X-RateLimit-Limit": str(settings.rate_limit_requests),
+        "X-RateLimit-Window": str(settings.rate_limit_window),
+        "X-RateLimit-Remaining": str(limiter.remaining(key)),
+        "X-RateLimit-Reset": str(limiter.retry_after(key))  # seconds from now
     }
 
 
-def custom_rate_limit_handler(request: Request, exc: RateLimitExceeded):
+def custom_rate_limit_handler(request: Request):
     """
     Custom handler for rate limit exceeded
     """
-    logger.warning(f"Rate limit exceeded for IP: {get_remote_address(request)}")
+    client_ip = get_remote_address(request)
+    logger.warning(f"Rate limit exceeded for IP: {client_ip}")
 
+    retry_after = limiter.retry_after(client_ip)
     raise HTTPException(
         status_code=status.HTTP_429_TOO_MANY_REQUESTS,
         detail={
             "error": "Rate limit exceeded",
             "message": "Too many requests. Please try again later.",
-            "retry_after": 60,  # seconds
-            "limit": "5 requests per minute"
+            "retry_after": retry_after,  # seconds
+            "limit": f"{settings.rate_limit_requests} requests per {settings.rate_limit_window} seconds"
         },
         headers={
-            "Retry-After": "60",
-            "X-RateLimit-Limit": "5",
-            "X-RateLimit-Window": "60",
-            "X-RateLimit-Remaining": "0",
-            "X-RateLimit-Reset": str(int(time.time()) + 60)
+            "Retry-After": str(retry_after),
+            **get_rate_limit_headers(client_ip)
         }
     )
@@ -1,39 +1,105 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Depends
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
+from contextlib import asynccontextmanager
 import logging
-import sys
+import orjson
+import os
 
-from .core.config import settings
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
+
+from .core.config import FrozenSettings, get_settings
+from .core.log_config import setup_logging
 from .core.rate_limit import setup_rate_limits
-from .api.upload import router as upload_router
-from .models.schemas import ErrorResponse
-
-# Configure logging
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.StreamHandler(sys.stdout),
-        logging.FileHandler('app.log')
-    ]
-)
+from .api.upload import router as upload_router, api_client, extractor_pool
 
 logger = logging.getLogger(__name__)
 
+settings = get_settings()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Open shared outbound resources on startup and release them on shutdown"""
+    # Logging is configured here rather than at import so importing the app
+    # (e.g. in tests) doesn't start a listener thread or create the log file
+    log_listener = setup_logging(settings.log_file)
+    extractor_pool.startup()
+    await api_client.startup()
+    yield
+    await api_client.shutdown()
+    extractor_pool.shutdown()
+    log_listener.stop()
+
+
+# Interactive docs and wildcard CORS are development conveniences only
+docs_url = "/docs" if settings.debug else None
+redoc_url = "/redoc" if settings.debug else None
+cors_origins = settings.cors_origins or (["*"] if settings.debug else [])
+
 # Create FastAPI application
 app = FastAPI(
     title=settings.app_name,
     version=settings.app_version,
     description="AI-powered customer data onboarding agent for Pocket.cm",
-    docs_url="/docs",
-    redoc_url="/redoc"
+    docs_url=docs_url,
+    redoc_url=redoc_url,
+    lifespan=lifespan
 )
 
-# Setup CORS middleware
+# Multipart boundaries and part headers on top of the file itself
+MULTIPART_OVERHEAD = 64 * 1024
+
+PAYLOAD_TOO_LARGE_BODY = orjson.dumps({
+    "detail": {
+        "error": "Payload too large",
+        "detail": f"File size exceeds limit of {settings.max_file_size} bytes"
+    }
+})
+
+
+class ContentLengthLimitMiddleware:
+    """
+    Reject requests whose declared Content-Length can't fit under max_file_size
+    with a 413 before any of the body is read or spooled to disk.
+    validate_file_security still checks the actual file size afterwards.
+    """
+
+    def __init__(self, app, max_body_size: int):
+        self.app = app
+        self.max_body_size = max_body_size
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http":
+            for name, value in scope["headers"]:
+                if name == b"content-length":
+                    if value.isdigit() and int(value) > self.max_body_size:
+                        await send({
+                            "type": "http.response.start",
+                            "status": 413,
+                            "headers": [
+                                (b"content-type", b"application/json"),
+                                (b"content-length", str(len(PAYLOAD_TOO_LARGE_BODY)).encode()),
+                                (b"connection", b"close"),
+                            ],
+                        })
+                        await send({"type": "http.response.body", "body": PAYLOAD_TOO_LARGE_BODY})
+                        return
+                    break
+        await self.app(scope, receive, send)
+
+
+app.add_middleware(
+    ContentLengthLimitMiddleware,
+    max_body_size=settings.max_file_size + MULTIPART_OVERHEAD
+)
+
+# Setup CORS middleware (added last so it wraps error responses too)
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=["*"],  # Configure appropriately for production
+    allow_origins=cors_origins,
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
@@ -46,33 +112,37 @@ setup_rate_limits(app)
 app.include_router(upload_router)
 
 
+# Same shape as ErrorResponse, built once instead of per error
+INTERNAL_ERROR_CONTENT = {
+    "error": "Internal server error",
+    "detail": "An unexpected error occurred"
+}
+
+
 @app.exception_handler(Exception)
 async def global_exception_handler(request, exc):
     """Global exception handler"""
     logger.error(f"Unhandled exception: {str(exc)}", exc_info=True)
     return JSONResponse(
         status_code=500,
-        content=ErrorResponse(
-            error="Internal server error",
-            detail="An unexpected error occurred"
-        ).dict()
+        content=INTERNAL_ERROR_CONTENT
     )
 
 
 @app.get("/")
-async def root():
+async def root(settings: FrozenSettings = Depends(get_settings)):
     """Root endpoint"""
     return {
         "service": settings.app_name,
         "version": settings.app_version,
         "status": "running",
-        "docs": "/docs",
+        "docs": docs_url,
         "health": "/api/v1/upload/health"
     }
 
 
 @app.get("/health")
-async def health_check():
+async def health_check(settings: FrozenSettings = Depends(get_settings)):
     """Health check endpoint"""
     return {
         "status": "healthy",
@@ -84,10 +154,17 @@ async def health_check():
 if __name__ == "__main__":
     import uvicorn
 
+    # Production: uvloop + httptools with one worker per CPU; debug keeps a
+    # single reloading worker on the stock asyncio loop. uvicorn installs the
+    # loop itself (run.sh passes --loop uvloop), so importing the app doesn't
+    # change the process-wide event loop policy
     uvicorn.run(
-        "main:app",
+        "src.main:app",
         host=settings.api_host,
         port=settings.api_port,
         reload=settings.debug,
+        loop="uvloop" if uvloop is not None and not settings.debug else "asyncio",
+        http="httptools",
+        workers=1 if settings.debug else (os.cpu_count() or 2),
         log_level="info"
     )
\ No newline at end of file
@@ -1,8 +1,11 @@
-from pydantic import BaseModel, Field, field_validator, model_validator, ConfigDict, field_serializer
+from pydantic import BaseModel, Field, field_validator, ConfigDict, field_serializer
 from enum import Enum
+from functools import lru_cache
 from datetime import date, datetime
-from typing import Optional, Any
+from typing import Optional, Any, Sequence
+import orjson
 import re
+import string
 
 
 class SubscriptionTier(str, Enum):
@@ -11,8 +14,130 @@ class SubscriptionTier(str, Enum):
     ENTERPRISE = "Enterprise"
 
 
+# Validator patterns, compiled once at import (_EMAIL_RE also backs the
+# vectorized email check in extraction)
+_EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+_ORDINAL_RE = re.compile(r'(\d+)(st|nd|rd|th)')
+_ORDINAL_SUFFIXES = ('st', 'nd', 'rd', 'th')
+
+# Character sets for _is_email (the same classes _EMAIL_RE uses)
+_TLD_CHARS = frozenset(string.ascii_letters)
+_DOMAIN_CHARS = frozenset(string.ascii_letters + string.digits + '.-')
+_LOCAL_CHARS = frozenset(string.ascii_letters + string.digits + '._%+-')
+
+
+def _is_email(s: str) -> bool:
+    """
+    Linear-scan equivalent of _EMAIL_RE.match: local@domain.tld with a single
+    '@', no regex engine (and no backtracking on hostile input)
+    """
+    # Cheap rejections first: the shortest valid address is 'a@b.co'
+    if len(s) < 6 or '@' not in s:
+        return False
+    at = s.find('@')
+    if at < 1:
+        return False
+    local, domain = s[:at], s[at + 1:]
+    dot = domain.rfind('.')
+    if dot < 1 or len(domain) - dot - 1 < 2:
+        return False
+    return (
+        _LOCAL_CHARS.issuperset(local)
+        and _DOMAIN_CHARS.issuperset(domain)
+        and _TLD_CHARS.issuperset(domain[dot + 1:])
+    )
+
+
+# Accepted signup date formats, in precedence order
+_DATE_FORMATS: tuple[str, ...] = (
+    '%Y-%m-%d',    # 2024-01-01
+    '%m/%d/%Y',    # 01/01/2024
+    '%d/%m/%Y',    # 01/01/2024 (European)
+    '%B %d, %Y',   # January 1, 2024
+    '%b %d, %Y',   # Jan 1, 2024
+    '%d %b %Y',    # 1 Jan 2024
+    '%d %b %y',    # 1 Jan 24
+    '%b %d %y',    # Jan 1 24
+    '%Y/%m/%d',    # 2024/01/01
+    '%d-%m-%Y',    # 01-01-2024
+    '%m-%d-%Y',    # 01-01-2024 (MM-DD-YYYY)
+    '%Y.%m.%d',    # 2024.02.01
+    '%d.%m.%Y',    # 01.02.2024
+)
+
+# Date formats grouped by the first non-digit character of the input (or
+# 'alpha' when it starts with a month name), in the same precedence order as
+# _DATE_FORMATS, so most inputs need one strptime call
+_FORMAT_DISPATCH: dict[str, tuple[str, ...]] = {
+    '-': ('%Y-%m-%d', '%d-%m-%Y', '%m-%d-%Y'),
+    '/': ('%m/%d/%Y', '%d/%m/%Y', '%Y/%m/%d'),
+    '.': ('%Y.%m.%d', '%d.%m.%Y'),
+    ' ': ('%d %b %Y', '%d %b %y'),
+    'alpha': ('%B %d, %Y', '%b %d, %Y', '%b %d %y'),
+}
+
+
+def _formats_for(v: str, fallback: Sequence[str]) -> Sequence[str]:
+    """Candidate formats for `v`; shapes the table doesn't know get the full list"""
+    for i, c in enumerate(v):
+        if not c.isdigit():
+            key = 'alpha' if i == 0 and c.isalpha() else c
+            return _FORMAT_DISPATCH.get(key, fallback)
+    return fallback
+
+
+@lru_cache(maxsize=4096)
+def _parse_date_str(v: str) -> date:
+    """
+    Parse a stripped signup date string. Bulk uploads repeat the same few
+    dates across many rows, so results are memoized (dates are immutable)
+    """
+    # ISO YYYY-MM-DD (the first and most common format) parses in C; the shape
+    # check keeps out the extra forms fromisoformat accepts (20240101, weeks)
+    if len(v) == 10 and v[4] == '-' and v[7] == '-':
+        try:
+            return date.fromisoformat(v)
+        except ValueError:
+            pass
+
+    for fmt in _formats_for(v, _DATE_FORMATS):
+        try:
+            return datetime.strptime(v, fmt).date()
+        except ValueError:
+            continue
+
+    # Try to parse ordinal suffixes (1st, 2nd, 3rd, 4th); plain substring
+    # checks rule out the common suffix-free case without the regex engine,
+    # and an unchanged string would only fail the same formats again
+    if any(suffix in v for suffix in _ORDINAL_SUFFIXES):
+        v_clean = _ORDINAL_RE.sub(r'\1', v)
+        if v_clean != v:
+            for fmt in _formats_for(v_clean, _DATE_FORMATS):
+                try:
+                    return datetime.strptime(v_clean, fmt).date()
+                except ValueError:
+                    continue
+
+    raise ValueError(f'Unable to parse date: {v}')
+
+
+# Case-folded tier spellings seen in uploads; anything else falls back to Basic
+_TIER_MAP: dict[str, SubscriptionTier] = {
+    'professional': SubscriptionTier.PRO,
+    'prem': SubscriptionTier.PRO,
+    'premium': SubscriptionTier.PRO,
+    'pro': SubscriptionTier.PRO,
+    'basic': SubscriptionTier.BASIC,
+    'enterprise': SubscriptionTier.ENTERPRISE,
+    'corp': SubscriptionTier.ENTERPRISE,
+    'corporate': SubscriptionTier.ENTERPRISE,
+}
+
+
 class CustomerRecord(BaseModel):
+    # Records are immutable once validated; frozen models are also hashable
     model_config = ConfigDict(
+        frozen=True,
         json_encoders={
             date: lambda v: v.isoformat()
         }
@@ -27,13 +152,26 @@ class CustomerRecord(BaseModel):
     def serialize_signup_date(self, value: date) -> str:
         return value.isoformat()
 
+    def to_dict(self) -> dict[str, str]:
+        """JSON-ready dict via plain attribute reads (same output as model_dump(mode='json'))"""
+        return {
+            'customer_name': self.customer_name,
+            'email': self.email,
+            'subscription_tier': self.subscription_tier.value,
+            'signup_date': self.signup_date.isoformat(),
+        }
+
+    def to_json(self) -> bytes:
+        """Compact JSON bytes; byte-for-byte the same as model_dump_json().encode()"""
+        return orjson.dumps(self.to_dict())
+
     @field_validator('email')
     @classmethod
     def validate_email(cls, v: str) -> str:
-        email_pattern = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-        if not re.match(email_pattern, v.strip().lower()):
+        email = v.strip().lower()
+        if not _is_email(email):
             raise ValueError(f'Invalid email format: {v}')
-        return v.strip().lower()
+        return email
 
     @field_validator('customer_name')
     @classmethod
@@ -50,19 +188,7 @@ class CustomerRecord(BaseModel):
             return v
 
         if isinstance(v, str):
-            tier_mapping = {
-                'professional': SubscriptionTier.PRO,
-                'prem': SubscriptionTier.PRO,
-                'premium': SubscriptionTier.PRO,
-                'pro': SubscriptionTier.PRO,
-                'basic': SubscriptionTier.BASIC,
-                'enterprise': SubscriptionTier.ENTERPRISE,
-                'corp': SubscriptionTier.ENTERPRISE,
-                'corporate': SubscriptionTier.ENTERPRISE,
-            }
-
-            normalized = v.strip().lower()
-            return tier_mapping.get(normalized, SubscriptionTier.BASIC)
+            return _TIER_MAP.get(v.strip().casefold(), SubscriptionTier.BASIC)
 
         # Default to Basic if type is unexpected
         return SubscriptionTier.BASIC
@@ -74,55 +200,14 @@ class CustomerRecord(BaseModel):
             return v
 
         if isinstance(v, str):
-            v = v.strip()
-
-            # Try various date formats
-            date_formats = [
-                '%Y-%m-%d',    # 2024-01-01
-                '%m/%d/%Y',    # 01/01/2024
-                '%d/%m/%Y',    # 01/01/2024 (European)
-                '%B %d, %Y',   # January 1, 2024
-                '%b %d, %Y',   # Jan 1, 2024
-                '%d %b %Y',    # 1 Jan 2024
-                '%d %b %y',    # 1 Jan 24
-                '%b %d %y',    # Jan 1 24
-                '%Y/%m/%d',    # 2024/01/01
-                '%d-%m-%Y',    # 01-01-2024
-                '%m-%d-%Y',    # 01-01-2024 (MM-DD-YYYY)
-                '%Y.%m.%d',    # 2024.02.01
-                '%d.%m.%Y',    # 01.02.2024
-            ]
-
-            for fmt in date_formats:
-                try:
-                    return datetime.strptime(v, fmt).date()
-                except ValueError:
-                    continue
-
-            # Try to parse ordinal suffixes (1st, 2nd, 3rd, 4th)
-            v_clean = re.sub(r'(\d+)(st|nd|rd|th)', r'\1', v)
-            for fmt in date_formats:
-                try:
-                    return datetime.strptime(v_clean, fmt).date()
-                except ValueError:
-                    continue
+            return _parse_date_str(v.strip())
 
         raise ValueError(f'Unable to parse date: {v}')
 
-    @model_validator(mode='before')
-    @classmethod
-    def validate_model(cls, data: Any) -> Any:
-        if isinstance(data, dict):
-            # Log warning for missing required fields
-            required_fields = ['customer_name', 'email', 'subscription_tier', 'signup_date']
-            missing_fields = [field for field in required_fields if field not in data]
-            if missing_fields:
-                raise ValueError(f'Missing required fields: {missing_fields}')
-        return data
-
-    
 
 class FileUploadResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     success: bool
     message: str
     processed_records: Optional[int] = None
@@ -130,5 +215,7 @@ class FileUploadResponse(BaseModel):
 
 
 class ErrorResponse(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
     error: str
     detail: Optional[str] = None
@@ -1,65 +1,135 @@
 import aiohttp
 import asyncio
 import logging
+import orjson
+import random
+import yarl
+from email.utils import parsedate_to_datetime
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 from ..models.schemas import CustomerRecord
 from ..core.config import settings
 
 logger = logging.getLogger(__name__)
 
+# UTC timestamps are emitted as RFC 3339 with a trailing "Z"
+_TIMESTAMP_OPTS = orjson.OPT_UTC_Z
+
+# Upper bound on how much of an error response body is read into memory
+_MAX_ERROR_BODY = 2048
+
 
 class APIClientService:
     def __init__(self):
         self.destination_url = settings.destination_api_url
+        # Parsed/built once; aiohttp would otherwise wrap the str URL on every post()
+        self._url = yarl.URL(self.destination_url)
+        self._timeout = aiohttp.ClientTimeout(total=30)
+        self._test_timeout = aiohttp.ClientTimeout(total=10)
         self.max_retries = settings.max_retries
         self.retry_delay = settings.retry_delay
+        self.retry_max_delay = settings.retry_max_delay
+        self.prefer_batch = settings.prefer_batch
+        self._base_headers = {
+            'Content-Type': 'application/json',
+            'User-Agent': f'{settings.app_name}/{settings.app_version}'
+        }
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._sem = asyncio.Semaphore(settings.api_concurrency)
+
+    async def startup(self):
+        """
+        Create the shared HTTP session (called from the app lifespan)
+        """
+        if self._session is not None and not self._session.closed:
+            return
+
+        self._session = aiohttp.ClientSession(
+            timeout=self._timeout,
+            connector=aiohttp.TCPConnector(limit=100, ttl_dns_cache=300, keepalive_timeout=60)
+        )
 
-    async def sync_customer_data(self, customers: List[CustomerRecord]) -> tuple[bool, Optional[str]]:
+    async def shutdown(self):
+        """
+        Close the shared HTTP session
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+    async def sync_customer_data(self, customers: List[CustomerRecord]) -> tuple[bool, Optional[str], int]:
         """
         Sync customer data to external API with retry mechanism
-        Returns: (success, error_message)
+        Returns: (success, error_message, unique_record_count); exact
+        duplicates are sent once and not counted
         """
         if not customers:
             logger.warning("No customers to sync")
-            return True, None
+            return True, None, 0
 
-        # Convert customers to JSON
+        # Session is normally opened by the app lifespan; open lazily otherwise
+        await self.startup()
+
+        # Convert customers to JSON once; the batch body (if any) reuses the same fragments
         try:
-            payload = {
-                "timestamp": datetime.utcnow().isoformat(),
-                "total_records": len(customers),
-                "customers": [customer.model_dump() for customer in customers]
-            }
-            json_data = [customer.model_dump_json() for customer in customers]
+            json_data = [customer.to_json() for customer in customers]
         except Exception as e:
             error_msg = f"Failed to serialize customer data: {str(e)}"
             logger.error(error_msg)
-            return False, error_msg
+            # Nothing was deduplicated, so no records are reported as skipped
+            return False, error_msg, len(customers)
+
+        # Drop exact duplicates (same canonical JSON), keeping first-seen order
+        unique_json = list(dict.fromkeys(json_data))
+        duplicates = len(json_data) - len(unique_json)
+        if duplicates:
+            logger.info(f"Skipped {duplicates} duplicate customer records")
 
         # Attempt to sync with retries
-        return await self._send_with_retry(json_data, payload)
+        success, error = await self._send_with_retry(unique_json)
+        return success, error, len(unique_json)
 
-    async def _send_with_retry(self, json_data: List[str], payload: dict) -> tuple[bool, Optional[str]]:
+    @staticmethod
+    def _build_batch_body(json_data: List[bytes]) -> bytes:
         """
-        Send data with exponential backoff retry mechanism
+        Assemble the batch envelope from already-serialized records
+        """
+        timestamp = orjson.dumps(datetime.now(timezone.utc), option=_TIMESTAMP_OPTS)
+        return (
+            b'{"timestamp":' + timestamp
+            + b',"total_records":' + str(len(json_data)).encode()
+            + b',"customers":[' + b','.join(json_data) + b']}'
+        )
+
+    async def _send_with_retry(self, json_data: List[bytes]) -> tuple[bool, Optional[str]]:
+        """
+        Send data with exponential backoff (full jitter) retry mechanism,
+        honouring the server's Retry-After when it asks for a longer wait
         """
         last_error = None
+        retry_after = None
 
         for attempt in range(self.max_retries + 1):  # +1 for initial attempt
             try:
                 if attempt > 0:
-                    delay = self.retry_delay * (2 ** (attempt - 1))  # Exponential backoff
-                    logger.info(f"Retrying in {delay} seconds (attempt {attempt + 1}/{self.max_retries + 1})")
+                    # Full jitter keeps simultaneous failures from retrying in lockstep
+                    delay = random.uniform(0, min(self.retry_max_delay, self.retry_delay * (2 ** (attempt - 1))))
+                    if retry_after is not None:
+                        delay = max(delay, min(retry_after, self.retry_max_delay))
+                    logger.info(f"Retrying in {delay:.2f} seconds (attempt {attempt + 1}/{self.max_retries + 1})")
                     await asyncio.sleep(delay)
 
-                success, error = await self._send_data(json_data, payload, attempt + 1)
+                success, error, retry_after = await self._send_data(json_data, attempt + 1)
                 if success:
                     return True, None
 
+                last_error = error
+                logger.warning(f"Attempt {attempt + 1} failed: {last_error}")
+
             except Exception as e:
                 last_error = str(e)
+                retry_after = None
                 logger.warning(f"Attempt {attempt + 1} failed: {last_error}")
 
         # All retries failed
@@ -67,111 +137,130 @@ class APIClientService:
         logger.error(error_msg)
         return False, error_msg
 
-    async def _send_data(self, json_data: List[str], payload: dict, attempt: int) -> tuple[bool, Optional[str]]:
+    async def _send_data(self, json_data: List[bytes], attempt: int) -> tuple[bool, Optional[str], Optional[float]]:
         """
         Send data to external API
+        Returns: (success, error_message, retry_after_seconds)
         """
-        timeout = aiohttp.ClientTimeout(total=30)  # 30 second timeout
+        session = self._session
 
         try:
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                # Create headers
-                headers = {
-                    'Content-Type': 'application/json',
-                    'User-Agent': f'{settings.app_name}/{settings.app_version}',
-                    'X-Attempt-Number': str(attempt),
-                    'X-Total-Records': str(len(json_data))
-                }
-
-                # Try to send as individual records first
-                if len(json_data) == 1:
-                    # Single record
-                    success, error = await self._send_single_record(session, json_data[0], headers)
-                    if success:
-                        return True, None
-                else:
-                    # Multiple records - try both individual and batch
-                    batch_success = True
-                    for record_json in json_data:
-                        success, error = await self._send_single_record(session, record_json, headers)
-                        if not success:
-                            batch_success = False
-                            break
+            # Overlay the per-attempt headers on the static ones
+            headers = {
+                **self._base_headers,
+                'X-Attempt-Number': str(attempt),
+                'X-Total-Records': str(len(json_data))
+            }
+
+            # Pick one strategy upfront: a single batch POST, or all records in flight at once
+            if len(json_data) <= 1 or self.prefer_batch:
+                return await self._send_batch(session, json_data, headers)
+
+            tasks = [self._send_single_record(session, record_json, headers) for record_json in json_data]
+            results = await asyncio.gather(*tasks, return_exceptions=True)
 
-                    if batch_success:
-                        return True, None
+            for result in results:
+                if isinstance(result, BaseException):
+                    return False, str(result), None
+                if not result[0]:
+                    return result
 
-                # Fallback: send as batch
-                return await self._send_batch(session, payload, headers)
+            return True, None, None
 
         except asyncio.TimeoutError:
-            return False, "Request timeout"
+            return False, "Request timeout", None
         except aiohttp.ClientError as e:
-            return False, f"HTTP client error: {str(e)}"
+            return False, f"HTTP client error: {str(e)}", None
         except Exception as e:
-            return False, f"Unexpected error: {str(e)}"
+            return False, f"Unexpected error: {str(e)}", None
+
+    @staticmethod
+    async def _read_error_text(response: aiohttp.ClientResponse) -> str:
+        """
+        Read at most _MAX_ERROR_BODY bytes of an error body (upstreams may send huge HTML pages)
+        """
+        return (await response.content.read(_MAX_ERROR_BODY)).decode('utf-8', errors='replace')
 
-    async def _send_single_record(self, session: aiohttp.ClientSession, record_json: str, headers: dict) -> tuple[bool, Optional[str]]:
+    @staticmethod
+    def _parse_retry_after(response: aiohttp.ClientResponse) -> Optional[float]:
         """
-        Send a single customer record
+        Seconds requested by a 429/503 Retry-After header (delta-seconds or HTTP-date)
         """
+        if response.status not in (429, 503):
+            return None
+
+        value = response.headers.get('Retry-After')
+        if not value:
+            return None
+
         try:
-            async with session.post(self.destination_url, data=record_json, headers=headers) as response:
-                if response.status in [200, 201, 202]:
-                    logger.info(f"Successfully synced single record. Status: {response.status}")
-                    return True, None
-                else:
-                    error_text = await response.text()
-                    logger.warning(f"Failed to sync record. Status: {response.status}, Error: {error_text}")
-                    return False, f"HTTP {response.status}: {error_text}"
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+    async def _send_single_record(self, session: aiohttp.ClientSession, record_json: bytes, headers: dict) -> tuple[bool, Optional[str], Optional[float]]:
+        """
+        Send a single customer record (bounded by the concurrency semaphore)
+        """
+        try:
+            async with self._sem:
+                async with session.post(self._url, data=record_json, headers=headers, timeout=self._timeout) as response:
+                    if response.status in [200, 201, 202]:
+                        logger.info(f"Successfully synced single record. Status: {response.status}")
+                        return True, None, None
+                    else:
+                        error_text = await self._read_error_text(response)
+                        logger.warning(f"Failed to sync record. Status: {response.status}, Error: {error_text}")
+                        return False, f"HTTP {response.status}: {error_text}", self._parse_retry_after(response)
         except Exception as e:
-            return False, str(e)
+            return False, str(e), None
 
-    async def _send_batch(self, session: aiohttp.ClientSession, payload: dict, headers: dict) -> tuple[bool, Optional[str]]:
+    async def _send_batch(self, session: aiohttp.ClientSession, json_data: List[bytes], headers: dict) -> tuple[bool, Optional[str], Optional[float]]:
         """
-        Send batch payload
+        Send all records as one batch payload (built only when this path is taken)
         """
         try:
-            import json
-            batch_json = json.dumps(payload)
+            batch_json = self._build_batch_body(json_data)
 
-            async with session.post(self.destination_url, data=batch_json, headers=headers) as response:
+            async with session.post(self._url, data=batch_json, headers=headers, timeout=self._timeout) as response:
                 if response.status in [200, 201, 202]:
                     logger.info(f"Successfully synced batch data. Status: {response.status}")
-                    return True, None
+                    return True, None, None
                 else:
-                    error_text = await response.text()
+                    error_text = await self._read_error_text(response)
                     logger.warning(f"Failed to sync batch. Status: {response.status}, Error: {error_text}")
-                    return False, f"HTTP {response.status}: {error_text}"
+                    return False, f"HTTP {response.status}: {error_text}", self._parse_retry_after(response)
         except Exception as e:
-            return False, str(e)
+            return False, str(e), None
 
     async def test_connection(self) -> tuple[bool, Optional[str]]:
         """
         Test connection to external API
         """
         try:
-            timeout = aiohttp.ClientTimeout(total=10)
-            async with aiohttp.ClientSession(timeout=timeout) as session:
-                test_payload = {
-                    "test": True,
-                    "timestamp": datetime.utcnow().isoformat(),
-                    "message": "Connection test from Pocket CM AI Agent"
-                }
-
-                headers = {
-                    'Content-Type': 'application/json',
-                    'User-Agent': f'{settings.app_name}/{settings.app_version}'
-                }
-
-                import json
-                async with session.post(self.destination_url, data=json.dumps(test_payload), headers=headers) as response:
-                    if response.status in [200, 201, 202]:
-                        logger.info("API connection test successful")
-                        return True, None
-                    else:
-                        error_text = await response.text()
-                        return False, f"Connection test failed. Status: {response.status}, Error: {error_text}"
+            await self.startup()
+
+            test_payload = {
+                "test": True,
+                "timestamp": datetime.now(timezone.utc),
+                "message": "Connection test from Pocket CM AI Agent"
+            }
+
+            async with self._session.post(self._url, data=orjson.dumps(test_payload, option=_TIMESTAMP_OPTS), headers=self._base_headers, timeout=self._test_timeout) as response:
+                if response.status in [200, 201, 202]:
+                    logger.info("API connection test successful")
+                    return True, None
+                else:
+                    error_text = await self._read_error_text(response)
+                    return False, f"Connection test failed. Status: {response.status}, Error: {error_text}"
 
         except Exception as e:
             return False, f"Connection test error: {str(e)}"
\ No newline at end of file
@@ -1,35 +1,111 @@
 import pandas as pd
 import pdfplumber
-import json
+import orjson
 from docx import Document
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union, BinaryIO
 import openai
 import instructor
 from openai import OpenAI
 from pathlib import Path
+import asyncio
+from concurrent.futures.process import BrokenProcessPool
 import io
 import logging
 import re
 import csv
+from datetime import date
+from functools import lru_cache
 
-from ..models.schemas import CustomerRecord
+try:
+    from pyarrow import csv as pa_csv
+except ImportError:  # optional fast path; the stdlib csv reader is used without it
+    pa_csv = None
+
+from ..models.schemas import (
+    CustomerRecord, SubscriptionTier, _EMAIL_RE as _RECORD_EMAIL_RE, _TIER_MAP, _is_email, _parse_date_str
+)
 from ..core.config import settings
+from .worker_pool import ExtractorPool
 
 logger = logging.getLogger(__name__)
 
+# Patterns compiled once at import rather than per document/column
+_EMAIL_RE = re.compile(r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}')
+_COL_NORMALIZE_RE = re.compile(r'[^a-z0-9]+')
+# Column mapping for common variations
+_COLUMN_ALIASES = {
+    'customer_name': ['name', 'customer', 'client_name', 'customer_name', 'fullname'],
+    'email': ['email', 'email_address', 'mail', 'contact_email'],
+    'subscription_tier': ['tier', 'subscription', 'plan', 'subscription_tier', 'level'],
+    'signup_date': ['date', 'signup_date', 'join_date', 'created', 'registration_date']
+}
+
+
+def _normalize_column(col_name: str) -> str:
+    return _COL_NORMALIZE_RE.sub('', str(col_name).strip().lower())
+
+
+# Normalized alias -> canonical field, built once
+_REVERSE_COL_MAP = {
+    _normalize_column(alias): field
+    for field, aliases in _COLUMN_ALIASES.items()
+    for alias in aliases
+}
+
+# The validator's full-string email pattern, for vectorized Series.str.match
+_EMAIL_PATTERN = _RECORD_EMAIL_RE.pattern
+
+_ARROW_CSV_CONVERT = pa_csv.ConvertOptions(strings_can_be_null=True) if pa_csv is not None else None
+
+# PDFs this short are extracted in a single pool task; splitting costs more than it saves
+_PDF_SERIAL_MAX_PAGES = 2
+
+# Uploads arrive either as raw bytes or as the (spooled) upload file itself
+FileSource = Union[bytes, BinaryIO]
+
+
+@lru_cache(maxsize=1)
+def _get_client() -> Optional[instructor.Instructor]:
+    """
+    OpenAI client patched by instructor for structured output, built once per
+    process so every service instance shares its HTTP connection pool
+    """
+    if not settings.openai_api_key:
+        logger.warning("OpenAI API key not configured. AI extraction will be limited.")
+        return None
+    return instructor.from_openai(OpenAI(api_key=settings.openai_api_key))
+
 
 class DataExtractionService:
     def __init__(self):
-        # Initialize OpenAI client with instructor for structured output
-        if settings.openai_api_key:
-            self.client = instructor.from_openai(OpenAI(api_key=settings.openai_api_key))
+        self.client = _get_client()
+
+    @staticmethod
+    def _as_stream(source: FileSource) -> BinaryIO:
+        """Return a binary stream positioned at the start of the content"""
+        if isinstance(source, (bytes, bytearray)):
+            return io.BytesIO(source)
+        source.seek(0)
+        return source
+
+    @staticmethod
+    def _read_text(source: FileSource) -> str:
+        """Read the whole source as text (only used by fallback paths)"""
+        if isinstance(source, (bytes, bytearray)):
+            data = source
         else:
-            self.client = None
-            logger.warning("OpenAI API key not configured. AI extraction will be limited.")
+            source.seek(0)
+            data = source.read()
+        return data.decode("utf-8", errors="ignore")
 
-    async def extract_data_from_file(self, file_content: bytes, filename: str) -> List[CustomerRecord]:
+    async def extract_data_from_file(
+        self, file_content: FileSource, filename: str, pool: Optional[ExtractorPool] = None
+    ) -> List[CustomerRecord]:
         """
-        Extract structured customer data from various file formats
+        Extract structured customer data from various file formats.
+        `file_content` may be bytes or a seekable binary file; parsers read
+        from the stream directly so uploads are not copied into memory first.
+        When `pool` is given, PDF text is extracted in its worker processes.
         """
         file_ext = Path(filename).suffix.lower()
 
@@ -41,7 +117,7 @@ class DataExtractionService:
             elif file_ext == '.json':
                 return await self._extract_from_json(file_content)
             elif file_ext == '.pdf':
-                return await self._extract_from_pdf(file_content)
+                return await self._extract_from_pdf(file_content, pool)
             elif file_ext == '.docx':
                 return await self._extract_from_docx(file_content)
             else:
@@ -50,53 +126,116 @@ class DataExtractionService:
             logger.error(f"Error extracting data from {filename}: {str(e)}")
             raise
 
-    async def _extract_from_csv(self, file_content: bytes) -> List[CustomerRecord]:
-        """Extract data from CSV files"""
+    def extract_data_from_file_sync(self, file_content: FileSource, filename: str) -> List[CustomerRecord]:
+        """Blocking variant of extract_data_from_file for use off the event loop"""
+        return asyncio.run(self.extract_data_from_file(file_content, filename))
+
+    def _read_csv_frame(self, file_content: FileSource) -> pd.DataFrame:
+        """Parse CSV with pyarrow's multi-threaded reader into Arrow-backed columns"""
+        # Read straight into an Arrow table (empty cells become nulls, as in pandas)
+        table = pa_csv.read_csv(
+            self._as_stream(file_content),
+            convert_options=_ARROW_CSV_CONVERT,
+        )
+        return table.to_pandas(types_mapper=pd.ArrowDtype)
+
+    async def _extract_from_csv(self, file_content: FileSource) -> List[CustomerRecord]:
+        """Extract data from CSV files (parsed in a worker thread)"""
+        return await asyncio.to_thread(self._extract_from_csv_sync, file_content)
+
+    def _extract_from_csv_sync(self, file_content: FileSource) -> List[CustomerRecord]:
         try:
-            df = pd.read_csv(
-                io.BytesIO(file_content),
-                skipinitialspace=True,
-                engine="python",  # more forgiving with messy spacing/quotes
-            )
-            records = self._dataframe_to_records(df)
+            if pa_csv is not None:
+                records = self._dataframe_to_records(self._read_csv_frame(file_content))
+            else:
+                records = self._csv_text_to_records(self._read_text(file_content))
             if records:
                 return records
 
             # Fallback: regex over raw text if structured parse yielded nothing
-            text = file_content.decode("utf-8", errors="ignore")
+            text = self._read_text(file_content)
             return self._extract_from_text_with_regex(text)
         except Exception as e:
             # Try sniffing delimiter and retry once before giving up
             try:
-                text = file_content.decode("utf-8", errors="ignore")
-                import csv
-
+                text = self._read_text(file_content)
                 dialect = csv.Sniffer().sniff(text.splitlines()[0])
-                df = pd.read_csv(
-                    io.BytesIO(file_content),
-                    skipinitialspace=True,
-                    engine="python",
-                    delimiter=dialect.delimiter,
-                )
-                records = self._dataframe_to_records(df)
+                records = self._csv_text_to_records(text, delimiter=dialect.delimiter)
                 if records:
                     return records
                 return self._extract_from_text_with_regex(text)
             except Exception:
                 raise ValueError(f"Failed to parse CSV: {str(e)}")
 
-    async def _extract_from_excel(self, file_content: bytes) -> List[CustomerRecord]:
-        """Extract data from Excel files"""
+    def _csv_text_to_records(self, text: str, delimiter: str = ',') -> List[CustomerRecord]:
+        """
+        Build records straight from csv.reader rows, without a DataFrame;
+        used when pyarrow isn't installed and for the sniffed-delimiter retry
+        """
+        reader = csv.reader(io.StringIO(text), delimiter=delimiter, skipinitialspace=True)
+        header = next(reader, [])
+        # Cells are read by position so a duplicated header resolves to its
+        # first column, as in the DataFrame path (DictReader keeps the last)
+        actual_columns = {
+            field: header.index(col) for field, col in self._resolve_columns(header).items()
+        }
+        name_idx = actual_columns['customer_name']
+        email_idx = actual_columns['email']
+        tier_idx = actual_columns.get('subscription_tier')
+        date_idx = actual_columns.get('signup_date')
+        today = date.today()
+
+        customers = []
+        for row in reader:
+            if not row:
+                continue  # blank line
+            width = len(row)
+            # Same normalization the validators apply, done inline per cell
+            name = ' '.join(row[name_idx].split()) if name_idx < width else ''
+            email = row[email_idx].strip().lower() if email_idx < width else ''
+            tier = SubscriptionTier.BASIC
+            if tier_idx is not None and tier_idx < width:
+                tier = _TIER_MAP.get(row[tier_idx].strip().casefold(), SubscriptionTier.BASIC)
+            signup_date = today
+            if date_idx is not None:
+                signup_date = row[date_idx].strip() if date_idx < width else ''
+                try:
+                    signup_date = _parse_date_str(signup_date)
+                except ValueError:
+                    pass  # left as-is so validation below reports it
+
+            customer_data = {
+                'customer_name': name,
+                'email': email,
+                'subscription_tier': tier,
+                'signup_date': signup_date,
+            }
+            if 1 <= len(name) <= 255 and _is_email(email) and type(signup_date) is date:
+                customers.append(CustomerRecord.model_construct(**customer_data))
+                continue
+            try:
+                customers.append(CustomerRecord.model_validate(customer_data))
+            except Exception as e:
+                logger.warning(f"Failed to process row: {customer_data}, Error: {str(e)}")
+                continue
+
+        return customers
+
+    async def _extract_from_excel(self, file_content: FileSource) -> List[CustomerRecord]:
+        """Extract data from Excel files (parsed in a worker thread)"""
+        return await asyncio.to_thread(self._extract_from_excel_sync, file_content)
+
+    def _extract_from_excel_sync(self, file_content: FileSource) -> List[CustomerRecord]:
         try:
-            df = pd.read_excel(io.BytesIO(file_content))
+            df = pd.read_excel(self._as_stream(file_content))
             return self._dataframe_to_records(df)
         except Exception as e:
             raise ValueError(f"Failed to parse Excel: {str(e)}")
 
-    async def _extract_from_json(self, file_content: bytes) -> List[CustomerRecord]:
+    async def _extract_from_json(self, file_content: FileSource) -> List[CustomerRecord]:
         """Extract data from JSON files"""
         try:
-            data = json.loads(file_content.decode('utf-8'))
+            data = orjson.loads(self._as_stream(file_content).read())
 
             # Handle different JSON structures
             if isinstance(data, list):
@@ -112,36 +251,63 @@ class DataExtractionService:
                 raise ValueError("Invalid JSON structure")
 
             return [CustomerRecord(**record) for record in records_data]
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             raise ValueError(f"Invalid JSON format: {str(e)}")
 
-    async def _extract_from_pdf(self, file_content: bytes) -> List[CustomerRecord]:
+    async def _extract_from_pdf(
+        self, file_content: FileSource, pool: Optional[ExtractorPool] = None
+    ) -> List[CustomerRecord]:
         """Extract data from PDF files using AI"""
         text_content = ""
         try:
-            # Extract text from PDF
-            with pdfplumber.open(io.BytesIO(file_content)) as pdf:
-                for page in pdf.pages:
-                    page_text = page.extract_text()
-                    if page_text:
-                        text_content += page_text + "\n"
+            # Extract text from PDF off the event loop; only the AI call stays async
+            if pool is not None:
+                text_content = await self._read_pdf_text_in_pool(file_content, pool)
+            else:
+                text_content = await asyncio.to_thread(self._read_pdf_text, file_content)
 
             if not text_content.strip():
                 raise ValueError("No text content found in PDF")
 
             return await self._extract_with_ai(text_content)
+        except BrokenProcessPool:
+            # A dead worker is a server fault, not an unreadable PDF
+            raise
         except Exception as e:
             logger.error(f"PDF extraction failed, falling back to regex: {str(e)}")
             return self._extract_from_text_with_regex(text_content)
 
-    async def _extract_from_docx(self, file_content: bytes) -> List[CustomerRecord]:
+    def _read_pdf_text(self, file_content: FileSource) -> str:
+        """Text of every page, extracted in-process"""
+        with pdfplumber.open(self._as_stream(file_content)) as pdf:
+            return _pages_text(pdf.pages)
+
+    async def _read_pdf_text_in_pool(self, file_content: FileSource, pool: ExtractorPool) -> str:
+        """
+        Extract the first pages in one pool worker, which also reports the page
+        count; longer PDFs split the remaining pages into up to pool.max_workers
+        ranges (at most extraction_chunk_size pages each) across the same pool
+        (pdfplumber layout analysis is pure Python, so threads would serialize on the GIL)
+        """
+        data = file_content if isinstance(file_content, (bytes, bytearray)) else self._as_stream(file_content).read()
+
+        first_chunk, page_count = await pool.run(_extract_pdf_pages, data, 0, _PDF_SERIAL_MAX_PAGES)
+        remaining = page_count - _PDF_SERIAL_MAX_PAGES
+        if remaining <= 0:
+            return first_chunk
+
+        chunk_size = max(1, min(settings.extraction_chunk_size, -(-remaining // pool.max_workers)))
+        rest = await asyncio.gather(*(
+            pool.run(_extract_pdf_pages, data, start, min(start + chunk_size, page_count))
+            for start in range(_PDF_SERIAL_MAX_PAGES, page_count, chunk_size)
+        ))
+        return "\n".join(chunk for chunk in (first_chunk, *(text for text, _ in rest)) if chunk)
+
+    async def _extract_from_docx(self, file_content: FileSource) -> List[CustomerRecord]:
         """Extract data from DOCX files using AI"""
         text_content = ""
         try:
-            doc = Document(io.BytesIO(file_content))
-
-            for paragraph in doc.paragraphs:
-                text_content += paragraph.text + "\n"
+            text_content = await asyncio.to_thread(self._read_docx_text, file_content)
 
             if not text_content.strip():
                 raise ValueError("No text content found in DOCX")
@@ -151,6 +317,11 @@ class DataExtractionService:
             logger.error(f"DOCX extraction failed, falling back to regex: {str(e)}")
             return self._extract_from_text_with_regex(text_content)
 
+    def _read_docx_text(self, file_content: FileSource) -> str:
+        """Newline-joined paragraph text of a DOCX document"""
+        doc = Document(self._as_stream(file_content))
+        return "\n".join(paragraph.text for paragraph in doc.paragraphs)
+
     async def _extract_with_ai(self, text_content: str) -> List[CustomerRecord]:
         """
         Use AI to extract structured data from unstructured text
@@ -179,8 +350,10 @@ class DataExtractionService:
             - signup_date (date in any format)
             """
 
-            # Use instructor to get structured output
-            customers = self.client.chat.completions.create(
+            # Use instructor to get structured output; the client is synchronous,
+            # so the request runs in a thread instead of stalling the event loop
+            customers = await asyncio.to_thread(
+                self.client.chat.completions.create,
                 model=settings.openai_model,
                 response_model=List[CustomerRecord],
                 messages=[{"role": "user", "content": prompt}],
@@ -197,43 +370,84 @@ class DataExtractionService:
         """
         Plan B: fall back to regex when no AI; grab emails first
         """
-        import re
-        from datetime import datetime
-
         customers = []
+        today = date.today()  # default signup date, shared by every record
+
+        # Manual approach: catch emails first, then look back for a name.
+        # Single pass: each line is scanned once and the name candidate is the
+        # text before the email on its own line
+        for line in text_content.split('\n'):
+            for match in _EMAIL_RE.finditer(line):
+                email = match.group()
+                try:
+                    name = "Unknown"  # Default name
+
+                    # Look for potential name before email
+                    words_before = line[:match.start()].split()
+                    if words_before and len(words_before) <= 3:
+                        name = ' '.join(words_before).title()
+
+                    customer_data = {
+                        'customer_name': name,
+                        'email': email.lower(),
+                        'subscription_tier': SubscriptionTier.BASIC,  # Default
+                        'signup_date': today  # Default to today
+                    }
+                    # The email matched _EMAIL_RE and the defaults are typed, so
+                    # only the name length is left to check before skipping the
+                    # validator chain; overlong names go through validation (and fail)
+                    if len(name) <= 255:
+                        customers.append(CustomerRecord.model_construct(**customer_data))
+                    else:
+                        customers.append(CustomerRecord.model_validate(customer_data))
+                except Exception as e:
+                    logger.warning(f"Failed to create customer record for email {email}: {str(e)}")
+                    continue
 
-        # Manual approach: catch emails first, then look back for a name
-        email_pattern = r'[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}'
-        emails = re.findall(email_pattern, text_content)
+        return customers if customers else []
 
-        for email in emails:
-            try:
-                # Lần tìm đoạn tên ngay trước email trên cùng một dòng
-                lines = text_content.split('\n')
-                name = "Unknown"  # Default name
-
-                for line in lines:
-                    if email in line:
-                        # Look for potential name before email
-                        words_before = line.split(email)[0].strip()
-                        if words_before and len(words_before.split()) <= 3:
-                            name = words_before.title()
-                        break
-
-                # Create a basic customer record
-                customer_data = {
-                    'customer_name': name,
-                    'email': email,
-                    'subscription_tier': 'Basic',  # Default
-                    'signup_date': datetime.now().strftime('%Y-%m-%d')  # Default to today
-                }
-
-                customers.append(CustomerRecord(**customer_data))
-            except Exception as e:
-                logger.warning(f"Failed to create customer record for email {email}: {str(e)}")
-                continue
+    @staticmethod
+    def _clean_text_column(col: pd.Series) -> pd.Series:
+        """Strip a text column; non-string values become missing and fail validation"""
+        if col.dtype != object and not pd.api.types.is_string_dtype(col):
+            return pd.Series(None, index=col.index, dtype=object)
+        return col.str.strip()
 
-        return customers if customers else []
+    @staticmethod
+    def _parse_date_column(col: pd.Series) -> pd.Series:
+        """
+        Parse each distinct date string once; unparseable values are left as-is
+        so the row is rejected (and logged) by CustomerRecord validation
+        """
+        if col.dtype != object and not pd.api.types.is_string_dtype(col):
+            return col  # already dates (e.g. date32 columns from the pyarrow reader)
+        stripped = col.str.strip()
+        parsed = {}
+        for raw in stripped.dropna().unique():
+            if isinstance(raw, str):
+                try:
+                    parsed[raw] = _parse_date_str(raw)
+                except ValueError:
+                    pass
+        mapped = stripped.map(parsed)
+        return mapped.where(mapped.notna(), col)
+
+    @staticmethod
+    def _resolve_columns(columns) -> Dict[str, Any]:
+        """
+        Map canonical field names to the matching source columns (one lookup per
+        column; the first match wins). Requires name and email columns
+        """
+        actual_columns = {}
+        for col in columns:
+            field = _REVERSE_COL_MAP.get(_normalize_column(col))
+            if field is not None and field not in actual_columns:
+                actual_columns[field] = col
+
+        # Check if we have minimum required columns
+        if 'customer_name' not in actual_columns or 'email' not in actual_columns:
+            raise ValueError("CSV must contain customer name and email columns")
+        return actual_columns
 
     def _dataframe_to_records(self, df: pd.DataFrame) -> List[CustomerRecord]:
         """
@@ -242,49 +456,84 @@ class DataExtractionService:
         """
         customers = []
 
-        # Column mapping for common variations
-        column_mapping = {
-            'customer_name': ['name', 'customer', 'client_name', 'customer_name', 'fullname'],
-            'email': ['email', 'email_address', 'mail', 'contact_email'],
-            'subscription_tier': ['tier', 'subscription', 'plan', 'subscription_tier', 'level'],
-            'signup_date': ['date', 'signup_date', 'join_date', 'created', 'registration_date']
-        }
+        actual_columns = self._resolve_columns(df.columns)
+
+        # Select matched columns under their canonical names and fill defaults for
+        # missing optional fields, so each row maps straight onto CustomerRecord
+        frame = df[list(actual_columns.values())].rename(
+            columns={col: field for field, col in actual_columns.items()}
+        )
+
+        # Normalize whole columns up front so the per-row validators hit their
+        # fast paths (clean strings, enum tiers, date objects)
+        # Names collapse whitespace with str.split() like the validator does; a
+        # regex \s on Arrow-backed columns (RE2) would miss non-ASCII whitespace
+        names = self._clean_text_column(frame['customer_name'])
+        frame['customer_name'] = names.map({n: ' '.join(n.split()) for n in names.dropna().unique()})
+        frame['email'] = self._clean_text_column(frame['email']).str.lower()
+        if 'subscription_tier' in frame.columns:
+            # Resolve tiers for the whole column at once; rows then skip the validator's lookup
+            # (mapping every distinct value keeps the enum members intact;
+            # fillna would coerce them back to plain str)
+            tiers = frame['subscription_tier'].astype(str).str.strip().str.casefold()
+            frame['subscription_tier'] = tiers.map(
+                {t: _TIER_MAP.get(t, SubscriptionTier.BASIC) for t in tiers.unique()}
+            )
+        else:
+            frame = frame.assign(subscription_tier=SubscriptionTier.BASIC)
+        if 'signup_date' in frame.columns:
+            frame['signup_date'] = self._parse_date_column(frame['signup_date'])
+        else:
+            frame = frame.assign(signup_date=date.today())
+
+        # Rows whose normalized values already satisfy every CustomerRecord
+        # constraint are built without re-running the validators; the rest go
+        # through full validation so the failure is reported per row
+        names = frame['customer_name']
+        clean = (
+            names.str.len().between(1, 255).fillna(False).astype(bool)
+            & frame['email'].str.match(_EMAIL_PATTERN).fillna(False).astype(bool)
+            & frame['signup_date'].map(lambda v: type(v) is date).astype(bool)
+        )
+
+        # Rows are streamed as plain tuples rather than materializing every row dict up front
+        fields = list(frame.columns)
+        for row, is_clean in zip(frame.itertuples(index=False, name=None), clean.tolist()):
+            customer_data = dict(zip(fields, row))
+            if is_clean:
+                customers.append(CustomerRecord.model_construct(**customer_data))
+                continue
+            try:
+                customers.append(CustomerRecord.model_validate(customer_data))
+            except Exception as e:
+                logger.warning(f"Failed to process row: {customer_data}, Error: {str(e)}")
+                continue
 
-        def normalize(col_name: str) -> str:
-            return re.sub(r'[^a-z0-9]+', '', col_name.strip().lower())
+        return customers
 
-        normalized_columns = {col: normalize(col) for col in df.columns}
 
-        # Find actual column names
-        actual_columns = {}
-        for field, possible_names in column_mapping.items():
-            normalized_targets = {normalize(name) for name in possible_names}
-            for col, norm in normalized_columns.items():
-                if norm in normalized_targets:
-                    actual_columns[field] = col
-                    break
+def _pages_text(pages) -> str:
+    """Newline-joined text of the pages that have any"""
+    return "\n".join(text for text in (page.extract_text() for page in pages) if text)
 
-        # Check if we have minimum required columns
-        if 'customer_name' not in actual_columns or 'email' not in actual_columns:
-            raise ValueError("CSV must contain customer name and email columns")
 
-        for _, row in df.iterrows():
-            try:
-                customer_data = {}
+def _extract_pdf_pages(file_content: bytes, start: int, stop: int) -> tuple[str, int]:
+    """
+    Text of pages [start, stop) of a PDF and its total page count
+    (runs in a worker process)
+    """
+    with pdfplumber.open(io.BytesIO(file_content)) as pdf:
+        return _pages_text(pdf.pages[start:stop]), len(pdf.pages)
 
-                for field in ['customer_name', 'email', 'subscription_tier', 'signup_date']:
-                    if field in actual_columns:
-                        customer_data[field] = row[actual_columns[field]]
-                    else:
-                        # Set defaults for missing fields
-                        if field == 'subscription_tier':
-                            customer_data[field] = 'Basic'
-                        elif field == 'signup_date':
-                            customer_data[field] = pd.Timestamp.now().strftime('%Y-%m-%d')
 
-                customers.append(CustomerRecord(**customer_data))
-            except Exception as e:
-                logger.warning(f"Failed to process row: {row.to_dict()}, Error: {str(e)}")
-                continue
+_worker_service: DataExtractionService | None = None
 
-        return customers
+
+def extract_in_worker(file_content: bytes, filename: str) -> list[CustomerRecord]:
+    """
+    Process-pool entry point: each worker process builds its own service once
+    """
+    global _worker_service
+    if _worker_service is None:
+        _worker_service = DataExtractionService()
+    return _worker_service.extract_data_from_file_sync(file_content, filename)
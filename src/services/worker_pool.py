@@ -0,0 +1,69 @@
+import asyncio
+import logging
+import multiprocessing
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any
+
+from ..core.log_config import configure_worker_logging
+
+logger = logging.getLogger(__name__)
+
+# The app process runs several threads (log listener, to_thread workers, pyarrow
+# and aiohttp pools) by the time the pool starts, and forking a threaded process
+# can deadlock the child on inherited locks. Workers start from a clean
+# forkserver instead (spawn where forkserver isn't available, e.g. Windows);
+# configure_worker_logging sets up everything a worker needs
+_MP_CONTEXT = multiprocessing.get_context(
+    "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+)
+
+
+class ExtractorPool:
+    """
+    Long-lived process pool for CPU-bound extraction. The executor is built
+    lazily and replaced if a worker dies, so one crashed worker (OOM, segfault)
+    doesn't leave every later submit failing with BrokenProcessPool
+    """
+
+    def __init__(self, max_workers: int, log_file: str):
+        self.max_workers = max(1, max_workers)
+        self.log_file = log_file
+        self._executor: ProcessPoolExecutor | None = None
+
+    def startup(self) -> ProcessPoolExecutor:
+        """
+        Create the executor if there isn't a live one; safe to call repeatedly
+        """
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=_MP_CONTEXT,
+                initializer=configure_worker_logging,
+                initargs=(self.log_file,)
+            )
+        return self._executor
+
+    def shutdown(self, wait: bool = False) -> None:
+        """
+        Stop the executor; a later startup() or run() builds a fresh one
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def run(self, fn: Callable[..., Any], *args: Any) -> Any:
+        """
+        Run fn(*args) in a worker process without blocking the event loop
+        """
+        executor = self.startup()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(executor, fn, *args)
+        except BrokenProcessPool:
+            # Drop the broken executor (unless a concurrent call already did);
+            # the next call starts a new one
+            if self._executor is executor:
+                logger.error("Extractor worker died; replacing the process pool")
+                self.shutdown()
+            raise
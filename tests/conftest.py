@@ -1,6 +1,13 @@
 import sys
 from pathlib import Path
 
+import pytest
+
+try:
+    import uvloop
+except ImportError:  # not available on Windows
+    uvloop = None
+
 
 # Ensure project root and /src are on sys.path so `import src...` works in tests
 ROOT = Path(__file__).resolve().parents[1]
@@ -10,3 +17,12 @@ for path in (ROOT, SRC):
     path_str = str(path)
     if path_str not in sys.path:
         sys.path.insert(0, path_str)
+
+
+if uvloop is not None:
+    @pytest.fixture
+    def event_loop():
+        """Run async tests on uvloop, matching the application event loop"""
+        loop = uvloop.new_event_loop()
+        yield loop
+        loop.close()
@@ -0,0 +1,160 @@
+import asyncio
+import json
+
+from src.models.schemas import CustomerRecord
+from src.services.api_client import APIClientService
+
+
+class FakeContent:
+    def __init__(self, body: bytes):
+        self.body = body
+
+    async def read(self, n: int = -1) -> bytes:
+        return self.body if n < 0 else self.body[:n]
+
+
+class FakeResponse:
+    def __init__(self, status: int, headers=None, body: bytes = b"error"):
+        self.status = status
+        self.headers = headers or {}
+        self.content = FakeContent(body)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+class FakeSession:
+    """Records POST bodies and answers with a fixed status per body"""
+
+    def __init__(self, fail_bodies=()):
+        self.bodies = []
+        self.fail_bodies = set(fail_bodies)
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+
+    def post(self, url, data=None, headers=None, **kwargs):
+        self.bodies.append(data)
+        session = self
+
+        class _Ctx(FakeResponse):
+            async def __aenter__(self):
+                session.in_flight += 1
+                session.max_in_flight = max(session.max_in_flight, session.in_flight)
+                await asyncio.sleep(0)
+                session.in_flight -= 1
+                return self
+
+        return _Ctx(500 if data in self.fail_bodies else 200)
+
+
+def make_customers(count: int) -> list[CustomerRecord]:
+    return [
+        CustomerRecord(
+            customer_name=f"Customer {i}",
+            email=f"customer{i}@example.com",
+            subscription_tier="Pro",
+            signup_date="2024-01-01",
+        )
+        for i in range(count)
+    ]
+
+
+async def test_default_policy_sends_one_batch_post():
+    service = APIClientService()
+    service._session = FakeSession()
+
+    success, error, _ = await service.sync_customer_data(make_customers(5))
+
+    assert success is True
+    assert error is None
+    assert len(service._session.bodies) == 1
+    assert json.loads(service._session.bodies[0])["total_records"] == 5
+
+
+async def test_records_are_posted_concurrently_when_batch_disabled():
+    service = APIClientService()
+    service.prefer_batch = False
+    service._session = FakeSession()
+
+    success, error, _ = await service.sync_customer_data(make_customers(5))
+
+    assert success is True
+    assert error is None
+    assert len(service._session.bodies) == 5
+    assert service._session.max_in_flight > 1
+
+
+async def test_failed_record_does_not_resend_as_batch():
+    service = APIClientService()
+    service.prefer_batch = False
+    service.max_retries = 0
+    customers = make_customers(3)
+    failing_body = customers[1].model_dump_json().encode()
+    service._session = FakeSession(fail_bodies={failing_body})
+
+    success, _, _ = await service.sync_customer_data(customers)
+
+    assert success is False
+    assert len(service._session.bodies) == 3
+
+
+async def test_batch_body_reuses_record_json():
+    service = APIClientService()
+    customers = make_customers(2)
+    service._session = FakeSession()
+
+    await service.sync_customer_data(customers)
+
+    batch = json.loads(service._session.bodies[-1])
+    assert batch["total_records"] == 2
+    assert batch["customers"] == [json.loads(c.model_dump_json()) for c in customers]
+
+
+async def test_retry_waits_for_retry_after(monkeypatch):
+    service = APIClientService()
+    service._session = FakeSession()
+    responses = [FakeResponse(429, {"Retry-After": "7"}), FakeResponse(200)]
+    service._session.post = lambda *args, **kwargs: responses.pop(0)
+
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    monkeypatch.setattr("src.services.api_client.asyncio.sleep", fake_sleep)
+
+    success, _, _ = await service.sync_customer_data(make_customers(1))
+
+    assert success is True
+    assert delays == [7.0]
+
+
+async def test_error_body_read_is_bounded():
+    service = APIClientService()
+    service.max_retries = 0
+    service._session = FakeSession()
+    service._session.post = lambda *args, **kwargs: FakeResponse(
+        500, body=b"x" * 100_000
+    )
+
+    success, error, _ = await service.sync_customer_data(make_customers(1))
+
+    assert success is False
+    assert error.count("x") == 2048
+
+
+async def test_duplicate_records_are_sent_once():
+    service = APIClientService()
+    service._session = FakeSession()
+    customers = make_customers(2)
+
+    success, _, synced_count = await service.sync_customer_data(customers + customers)
+
+    assert success is True
+    assert synced_count == 2
+    batch = json.loads(service._session.bodies[0])
+    assert batch["total_records"] == 2
@@ -0,0 +1,25 @@
+import dataclasses
+
+import pytest
+
+from src.core.config import FrozenSettings, Settings, get_settings, settings
+
+
+def test_get_settings_is_cached():
+    assert get_settings() is get_settings()
+    assert get_settings() is settings
+
+
+def test_settings_are_frozen():
+    with pytest.raises(dataclasses.FrozenInstanceError):
+        settings.debug = True
+
+
+def test_default_mime_types_are_immutable():
+    assert isinstance(settings.allowed_mime_types, tuple)
+    assert "application/pdf" in settings.allowed_mime_types
+
+
+def test_frozen_settings_fields_match_settings():
+    frozen_fields = {f.name for f in dataclasses.fields(FrozenSettings)}
+    assert frozen_fields == set(Settings.model_fields)
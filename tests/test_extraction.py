@@ -1,12 +1,23 @@
+import asyncio
+import dataclasses
+import time
 from datetime import date
+from types import SimpleNamespace
+
+import pandas as pd
 
-from src.services.extraction import DataExtractionService
 from src.models.schemas import CustomerRecord
+from src.services import extraction
+from src.services.extraction import DataExtractionService, extract_in_worker
+from src.services.worker_pool import ExtractorPool
 
 
 def test_regex_extraction_fallback_produces_record():
     service = DataExtractionService()
-    text = "Alice Johnson alice@example.com signed up on Jan 1st, 2024 with enterprise plan."
+    text = (
+        "Alice Johnson alice@example.com signed up on Jan 1st, 2024 "
+        "with enterprise plan."
+    )
 
     customers = service._extract_from_text_with_regex(text)
 
@@ -18,3 +29,235 @@ def test_regex_extraction_fallback_produces_record():
     # Regex fallback defaults tier to Basic and date to today if not parsed
     assert customer.subscription_tier == customer.subscription_tier.BASIC
     assert customer.signup_date == date.today()
+
+
+def test_regex_extraction_takes_name_from_the_email_line():
+    service = DataExtractionService()
+    text = "Customers\nbob smith BOB@example.com\nno name here at all carol@example.com"
+
+    customers = service._extract_from_text_with_regex(text)
+
+    assert [(c.customer_name, c.email) for c in customers] == [
+        ("Bob Smith", "bob@example.com"),
+        ("Unknown", "carol@example.com"),
+    ]
+
+
+def test_regex_extraction_rejects_overlong_names():
+    service = DataExtractionService()
+
+    assert service._extract_from_text_with_regex("A" * 300 + " bob@example.com") == []
+
+
+def test_extract_in_worker_parses_csv_bytes():
+    content = (
+        b"name,email,plan,signup_date\n"
+        b"Bob Smith,bob@example.com,premium,2024-02-01\n"
+    )
+
+    customers = extract_in_worker(content, "customers.csv")
+
+    assert len(customers) == 1
+    assert customers[0].email == "bob@example.com"
+    assert customers[0].subscription_tier == customers[0].subscription_tier.PRO
+    assert customers[0].signup_date == date(2024, 2, 1)
+
+
+async def test_extract_in_worker_logs_reach_the_log_file(tmp_path):
+    log_file = tmp_path / "app.log"
+    pool = ExtractorPool(max_workers=1, log_file=str(log_file))
+    try:
+        assert await pool.run(extract_in_worker, b"not a docx", "broken.docx") == []
+    finally:
+        pool.shutdown(wait=True)
+
+    assert "DOCX extraction failed" in log_file.read_text()
+
+
+def _make_pdf(lines):
+    """Minimal PDF with one line of Helvetica text per page"""
+    count = len(lines)
+    kids = " ".join(f"{3 + 2 * i} 0 R" for i in range(count))
+    objects = [
+        "<< /Type /Catalog /Pages 2 0 R >>",
+        f"<< /Type /Pages /Kids [{kids}] /Count {count} >>",
+    ]
+    font = 3 + 2 * count
+    for i, line in enumerate(lines):
+        stream = f"BT /F1 12 Tf 72 720 Td ({line}) Tj ET"
+        objects.append(
+            "<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 792] "
+            f"/Contents {4 + 2 * i} 0 R "
+            f"/Resources << /Font << /F1 {font} 0 R >> >> >>"
+        )
+        objects.append(f"<< /Length {len(stream)} >>\nstream\n{stream}\nendstream")
+    objects.append("<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>")
+
+    out, offsets = b"%PDF-1.4\n", []
+    for number, obj in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n{obj}\nendobj\n".encode()
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    out += b"".join(f"{offset:010d} 00000 n \n".encode() for offset in offsets)
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return out
+
+
+async def test_pdf_text_in_pool_matches_serial_across_chunks(tmp_path, monkeypatch):
+    small_chunks = dataclasses.replace(extraction.settings, extraction_chunk_size=2)
+    monkeypatch.setattr(extraction, "settings", small_chunks)
+    service = DataExtractionService()
+    pdf = _make_pdf([f"Customer {i} c{i}@example.com" for i in range(5)])
+    pool = ExtractorPool(max_workers=2, log_file=str(tmp_path / "app.log"))
+    try:
+        text = await service._read_pdf_text_in_pool(pdf, pool)
+    finally:
+        pool.shutdown(wait=True)
+
+    assert text == service._read_pdf_text(pdf)
+    assert text.splitlines()[-1] == "Customer 4 c4@example.com"
+
+
+async def test_ten_page_pdf_is_split_across_pool_tasks(tmp_path):
+    service = DataExtractionService()
+    pdf = _make_pdf([f"Customer {i} c{i}@example.com" for i in range(10)])
+    pool = ExtractorPool(max_workers=4, log_file=str(tmp_path / "app.log"))
+    ranges = []
+    run = pool.run
+
+    async def recording_run(fn, *args):
+        ranges.append(args[1:])
+        return await run(fn, *args)
+
+    pool.run = recording_run
+    try:
+        text = await service._read_pdf_text_in_pool(pdf, pool)
+    finally:
+        pool.shutdown(wait=True)
+
+    assert len(ranges) > 1
+    assert ranges == [(0, 2), (2, 4), (4, 6), (6, 8), (8, 10)]
+    assert text == service._read_pdf_text(pdf)
+
+
+async def test_ai_extraction_does_not_block_the_event_loop():
+    record = CustomerRecord(
+        customer_name="Ann Lee", email="ann@example.com",
+        subscription_tier="Pro", signup_date="2024-01-01",
+    )
+
+    def slow_create(**kwargs):
+        time.sleep(0.3)  # stands in for a slow synchronous LLM request
+        return [record]
+
+    service = DataExtractionService()
+    service.client = SimpleNamespace(
+        chat=SimpleNamespace(completions=SimpleNamespace(create=slow_create))
+    )
+
+    ticks = 0
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    ticking = asyncio.create_task(ticker())
+    try:
+        assert await service._extract_with_ai("Ann Lee ann@example.com") == [record]
+    finally:
+        ticking.cancel()
+
+    assert ticks >= 10
+
+
+def test_dataframe_to_records_maps_columns_and_skips_bad_rows():
+    service = DataExtractionService()
+    df = pd.DataFrame({
+        "Full Name": ["Carol King", "Bad Row"],
+        "Email": ["carol@example.com", "not-an-email"],
+    })
+
+    customers = service._dataframe_to_records(df)
+
+    assert len(customers) == 1
+    assert customers[0].customer_name == "Carol King"
+    assert customers[0].subscription_tier == customers[0].subscription_tier.BASIC
+    assert customers[0].signup_date == date.today()
+
+
+def test_dataframe_to_records_resolves_tier_column():
+    service = DataExtractionService()
+    df = pd.DataFrame({
+        "Name": ["A One", "B Two", "C Three"],
+        "Email": ["a@example.com", "b@example.com", "c@example.com"],
+        "Plan": [" Premium ", "corp", None],
+    })
+
+    tiers = [c.subscription_tier.value for c in service._dataframe_to_records(df)]
+
+    assert tiers == ["Pro", "Enterprise", "Basic"]
+
+
+def test_dataframe_to_records_normalizes_columns_before_validation():
+    service = DataExtractionService()
+    df = pd.DataFrame({
+        "Name": ["  Dana   Scully ", "Fox Mulder"],
+        "Email": [" DANA@FBI.gov ", "fox@fbi.gov"],
+        "Signup Date": ["02/01/2024", "not a date"],
+    })
+
+    customers = service._dataframe_to_records(df)
+
+    assert len(customers) == 1
+    assert customers[0].customer_name == "Dana Scully"
+    assert customers[0].email == "dana@fbi.gov"
+    assert customers[0].signup_date == date(2024, 2, 1)
+
+
+def test_csv_text_to_records_matches_dataframe_path():
+    service = DataExtractionService()
+    text = (
+        "Name;Email;Plan;Date\n"
+        " Dana  Scully ;DANA@fbi.gov;Premium;02/01/2024\n"
+        "Bad;nope;pro;2024-01-01\n"
+    )
+
+    customers = service._csv_text_to_records(text, delimiter=";")
+
+    assert len(customers) == 1
+    assert customers[0] == CustomerRecord(
+        customer_name="Dana Scully",
+        email="dana@fbi.gov",
+        subscription_tier="Pro",
+        signup_date="2024-02-01",
+    )
+
+
+def test_csv_text_to_records_uses_first_duplicated_column():
+    service = DataExtractionService()
+    text = "name,email,email\nEve Moneypenny,eve@mi6.gov,other@mi6.gov\n"
+
+    customers = service._csv_text_to_records(text)
+
+    assert [c.email for c in customers] == ["eve@mi6.gov"]
+    assert service._extract_from_csv_sync(text.encode()) == customers
+
+
+def test_csv_names_collapse_non_ascii_whitespace():
+    service = DataExtractionService()
+    text = (
+        "name,email\n"
+        "Ann\xa0\xa0Lee,ann@example.com\n"
+        "Bo\x0b\x0b Kim,bo@example.com\n"
+        "Cy\u2003\u2003Doe,cy@example.com\n"
+    )
+
+    customers = service._extract_from_csv_sync(text.encode())
+
+    assert [c.customer_name for c in customers] == ["Ann Lee", "Bo Kim", "Cy Doe"]
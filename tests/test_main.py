@@ -0,0 +1,31 @@
+from src.main import ContentLengthLimitMiddleware
+
+
+async def call_with_length(length: bytes):
+    sent = []
+    downstream = []
+
+    async def app(scope, receive, send):
+        downstream.append(scope)
+
+    async def send(message):
+        sent.append(message)
+
+    middleware = ContentLengthLimitMiddleware(app, max_body_size=100)
+    scope = {"type": "http", "headers": [(b"content-length", length)]}
+    await middleware(scope, None, send)
+    return sent, downstream
+
+
+async def test_oversized_content_length_is_rejected_before_the_app():
+    sent, downstream = await call_with_length(b"101")
+
+    assert sent[0]["status"] == 413
+    assert downstream == []
+
+
+async def test_content_length_within_limit_passes_through():
+    sent, downstream = await call_with_length(b"100")
+
+    assert sent == []
+    assert len(downstream) == 1
@@ -0,0 +1,31 @@
+from src.core.rate_limit import SlidingWindowLimiter
+
+
+async def test_window_blocks_after_capacity_is_spent():
+    limiter = SlidingWindowLimiter(capacity=2, window=60)
+
+    assert await limiter.check("1.2.3.4") is True
+    assert await limiter.check("1.2.3.4") is True
+    assert await limiter.check("1.2.3.4") is False
+    assert 0 < limiter.retry_after("1.2.3.4") <= 60
+    # Other clients have their own window
+    assert await limiter.check("5.6.7.8") is True
+
+
+async def test_hits_expire_after_window():
+    limiter = SlidingWindowLimiter(capacity=1, window=60)
+
+    assert await limiter.check("1.2.3.4") is True
+    limiter._hits["1.2.3.4"][0] -= 61
+
+    assert await limiter.check("1.2.3.4") is True
+
+
+async def test_least_recent_client_is_evicted():
+    limiter = SlidingWindowLimiter(capacity=1, window=60, max_keys=2)
+
+    await limiter.check("a")
+    await limiter.check("b")
+    await limiter.check("c")
+
+    assert list(limiter._hits) == ["b", "c"]
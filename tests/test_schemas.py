@@ -1,6 +1,8 @@
-import pytest
 from datetime import date
 
+import pytest
+from pydantic import ValidationError
+
 from src.models.schemas import CustomerRecord, SubscriptionTier
 
 
@@ -38,6 +40,18 @@ def test_signup_date_parses_ordinal_suffix():
     assert record.signup_date == date(2024, 1, 1)
 
 
+@pytest.mark.parametrize("raw, expected", [
+    ("2024-02-01", date(2024, 2, 1)),
+    ("02/01/2024", date(2024, 2, 1)),    # US order wins when ambiguous
+    ("13/01/2024", date(2024, 1, 13)),   # falls through to European order
+    ("01.02.2024", date(2024, 2, 1)),
+    ("1 Feb 24", date(2024, 2, 1)),
+    ("February 1, 2024", date(2024, 2, 1)),
+])
+def test_signup_date_formats(raw, expected):
+    assert CustomerRecord.parse_signup_date(raw) == expected
+
+
 def test_missing_required_field_raises_error():
     with pytest.raises(ValueError):
         CustomerRecord(
@@ -45,3 +59,47 @@ def test_missing_required_field_raises_error():
             subscription_tier="Basic",
             signup_date="2024-01-01",
         )
+
+
+def test_customer_record_is_frozen():
+    record = CustomerRecord(
+        customer_name="Jane",
+        email="jane@example.com",
+        subscription_tier="Pro",
+        signup_date="2024-01-01",
+    )
+
+    with pytest.raises(ValidationError):
+        record.email = "other@example.com"
+
+
+@pytest.mark.parametrize(
+    "email",
+    [
+        "no-at.example.com",
+        "@example.com",
+        "a@b@example.com",
+        "a@example.c",
+        "a@example.c0m",
+    ],
+)
+def test_invalid_email_is_rejected(email):
+    with pytest.raises(ValidationError):
+        CustomerRecord(
+            customer_name="Jane",
+            email=email,
+            subscription_tier="Pro",
+            signup_date="2024-01-01",
+        )
+
+
+def test_to_json_matches_pydantic_serialization():
+    record = CustomerRecord(
+        customer_name='Zoë "Z" Ng',
+        email="zoe@example.com",
+        subscription_tier="corp",
+        signup_date="2024-03-09",
+    )
+
+    assert record.to_dict() == record.model_dump(mode="json")
+    assert record.to_json() == record.model_dump_json().encode()
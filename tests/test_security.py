@@ -0,0 +1,94 @@
+import io
+
+import pytest
+from fastapi import UploadFile
+
+from src.core import security
+from src.core.security import FileSecurityValidator, validate_file_security
+
+
+@pytest.mark.parametrize("filename", [
+    "customers.csv",
+    "Customers Export.XLSX",
+    "report.v2.pdf",
+])
+def test_valid_filenames_are_accepted(filename):
+    assert FileSecurityValidator._validate_filename(filename) is True
+
+
+@pytest.mark.parametrize("filename", [
+    "",
+    "../secrets.csv",
+    "dir/customers.csv",
+    "dir\\customers.csv",
+    "bad\x00name.csv",
+    "what?.csv",
+    "customers.exe",
+])
+def test_invalid_filenames_are_rejected(filename):
+    assert FileSecurityValidator._validate_filename(filename) is False
+
+
+def test_signature_check_matches_known_magic_numbers():
+    check = FileSecurityValidator._validate_file_signature
+
+    assert check(b"%PDF-1.4\n", "doc.pdf") is True
+    assert check(b"PK\x03\x04rest", "sheet.xlsx") is True
+    assert check(b"name,email\n", "customers.csv") is True
+
+
+@pytest.mark.parametrize("content, expected", [
+    (b'{"customers": []}', True),
+    (b'  \n[{"email": "a@b.com"}]', True),
+    (b'\xef\xbb\xbf{"customers": []}', True),
+    (b'"just a string"', False),
+])
+def test_json_signature_check(content, expected):
+    check = FileSecurityValidator._validate_file_signature
+
+    assert check(content, "customers.json") is expected
+
+
+def test_csv_signature_check_does_not_require_complete_utf8():
+    # A 1 KB head can end mid-way through a multi-byte character
+    head = ("name,city\n" + "Zoë,Köln\n" * 200).encode("utf-8")[:1025]
+    check = FileSecurityValidator._validate_file_signature
+
+    assert check(head, "customers.csv") is True
+    assert check(b"name;email", "customers.csv") is True
+    assert check(b"no delimiters", "customers.csv") is False
+
+
+def test_signature_check_rejects_mismatched_binary():
+    check = FileSecurityValidator._validate_file_signature
+
+    assert check(b"PK\x03\x04rest", "doc.pdf") is False
+
+
+def test_validate_file_security_uses_reported_size_and_rewinds():
+    upload = UploadFile(
+        file=io.BytesIO(b"name,email\nA B,a@b.com\n"), filename="customers.csv", size=50
+    )
+
+    assert validate_file_security(upload, max_size=40) == (
+        False, "File size exceeds limit of 40 bytes"
+    )
+    assert validate_file_security(upload, max_size=1024) == (True, None)
+    assert upload.file.tell() == 0
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("/tmp/my customers.csv", "my_customers.csv"),
+    ('bad<:"|?*name.csv', "badname.csv"),
+    ("a < b.csv", "a__b.csv"),
+    ("", "uploaded_file"),
+])
+def test_sanitize_filename(raw, expected):
+    assert FileSecurityValidator.sanitize_filename(raw) == expected
+
+
+def test_validator_class_forwards_to_module_functions():
+    validator = FileSecurityValidator
+
+    assert validator.validate_file_security is security.validate_file_security
+    assert validator.sanitize_filename is security.sanitize_filename
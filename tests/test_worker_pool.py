@@ -0,0 +1,32 @@
+import os
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from src.services.worker_pool import ExtractorPool
+
+
+def _crash():
+    os._exit(1)
+
+
+async def test_pool_is_replaced_after_a_worker_dies(tmp_path):
+    pool = ExtractorPool(max_workers=1, log_file=str(tmp_path / "app.log"))
+    try:
+        with pytest.raises(BrokenProcessPool):
+            await pool.run(_crash)
+
+        assert await pool.run(os.getpid) != os.getpid()
+    finally:
+        pool.shutdown(wait=True)
+
+
+async def test_pool_can_restart_after_shutdown(tmp_path):
+    pool = ExtractorPool(max_workers=1, log_file=str(tmp_path / "app.log"))
+    pool.startup()
+    pool.shutdown(wait=True)
+
+    try:
+        assert await pool.run(abs, -3) == 3
+    finally:
+        pool.shutdown(wait=True)